@@ -1,15 +1,14 @@
 """Limiters are what define how resources should be limited as well as handle."""
 from __future__ import annotations
 
-from abc import ABC, abstractmethod
 from typing import Any, Callable, Type
 
 import os
-import platform
+import pickle
 import signal
 import sys
-import traceback
 import warnings
+from functools import lru_cache
 from multiprocessing.connection import Connection
 
 from pynisher.exceptions import (
@@ -18,31 +17,74 @@ from pynisher.exceptions import (
     PynisherException,
     WallTimeoutException,
 )
-from pynisher.util import Monitor, callstring, terminate_process
+from pynisher.util import Monitor, _SharedMemoryResponse, callstring, terminate_process
 from pynisher.win_errcodes import WIN_ERROR_COMMITMENT_LIMIT
 
+# Responses whose pickled payload meets this size are handed back through a
+# shared memory block instead of the pipe, see `_SharedMemoryResponse`.
+# Set to the typical pipe capacity, anything past it can't be written in one go
+_SHM_RESULT_THRESHOLD = 2**16  # 64KB
+
+# Memory limits below this may plausibly already be exceeded by a fresh
+# process at startup, making the usage pre-check warning worth a memory read.
+# For more generous limits the read is skipped
+_MEM_PRECHECK_THRESHOLD = 2**28  # 256MB
+
+# The platform can't change at runtime, no need to re-check it per error
+_IS_WIN = sys.platform.startswith("win")
+
+
+def _format_tb(err: BaseException) -> str:
+    """Format a caught exception as a traceback string.
+
+    Only called on the error path, the success path never formats anything.
+    The import lives here too so the happy path never pays for it.
+
+    Parameters
+    ----------
+    err : BaseException
+        The exception to format. The explicit three argument form is kept
+        over `format_exception(err)` as the latter is 3.10+ only.
+    """
+    import traceback
+
+    return "".join(traceback.format_exception(type(err), err, err.__traceback__))
+
 
 def is_err(err: Exception, err_type: str | Type[Exception]) -> bool:
     """Return if err is of a given type"""
-    # Check name of class matches
-    a = isinstance(err_type, str) and type(err).__name__ == err_type
-
     # Explicitly check for just class, not subclass
     # We do this because many library specific errors may inherit from base errors
     # and we don't want to accidentally wrap to many errors.
     # i.e. sklearn.exceptions.NotFittedError inherits form ValueError
-    b = isinstance(err_type, type) and err is err_type
+    if isinstance(err_type, type):
+        return type(err) is err_type
 
-    return a or b
+    # Otherwise check the name of the class matches
+    return type(err).__name__ == err_type
 
 
-class Limiter(ABC):
+class Limiter:
     """Defines how to limit resources for a given system."""
 
+    # A fresh Limiter crosses into every subprocess, slots keep it small to
+    # pickle/fork and make the attribute reads in __call__ direct slot loads
+    __slots__ = (
+        "func",
+        "output",
+        "memory",
+        "cpu_time",
+        "wall_time",
+        "warnings",
+        "wrap_errors",
+        "terminate_child_processes",
+        "_wrap_mapping",
+    )
+
     def __init__(
         self,
         func: Callable,
-        output: Connection,
+        output: Connection | None = None,
         memory: int | None = None,
         cpu_time: int | None = None,
         wall_time: int | None = None,
@@ -56,8 +98,9 @@ class Limiter(ABC):
         func : Callable
             The function to be limited
 
-        output : Connection
-            The output multiprocessing.Connection object to pass the results back
+        output : Connection | None = None
+            The output multiprocessing.Connection object to pass the results back.
+            May be attached later, as long as it's set before __call__.
 
         memory : int | None = None
             The memory in bytes to allocate
@@ -88,6 +131,19 @@ class Limiter(ABC):
         self.wrap_errors = wrap_errors
         self.terminate_child_processes = terminate_child_processes
 
+        # Normalize the list/dict forms of `wrap_errors` once here so
+        # `_wrap_error` doesn't re-classify them for every raised exception.
+        # The bool forms short-circuit before the mapping is consulted
+        self._wrap_mapping: dict[str, Any] | None
+        if isinstance(wrap_errors, bool):
+            self._wrap_mapping = None
+        elif isinstance(wrap_errors, (list, set, tuple)):
+            self._wrap_mapping = {"pynisher": wrap_errors}
+        elif isinstance(wrap_errors, dict):
+            self._wrap_mapping = wrap_errors
+        else:
+            raise ValueError(f"Arg `wrap_errors` is ill formatted {wrap_errors}")
+
     def __call__(self, *args: Any, **kwargs: Any) -> None:
         """Set process limits and then call the function with the given arguments.
 
@@ -105,6 +161,10 @@ class Limiter(ABC):
         -------
         None
         """
+        # Attached by the parent before the subprocess was spawned
+        output = self.output
+        assert output is not None, "`output` must be set before calling"
+
         # Make sure that if this process is killed, make any connections are closed
         # and the subprocess is killed
         _default_sigterm_handler: signal._HANDLER = signal.getsignal(signal.SIGTERM)
@@ -114,11 +174,16 @@ class Limiter(ABC):
                 " ignoring this as the output connection must be closed "
             )
 
-        def _closing_handler(sig: int, frame: Any) -> None:
-            self.output.close()
+        # `_sigterm` is bound as a default so the handler body does a local
+        # load instead of a module attribute lookup in interrupted context.
+        # Compared with `==` as handlers receive a plain int, not the enum
+        def _closing_handler(
+            sig: int, frame: Any, _sigterm: int = int(signal.SIGTERM)
+        ) -> None:
+            output.close()
 
             # Let the default handler run
-            if sig is signal.SIGTERM and callable(_default_sigterm_handler):
+            if sig == _sigterm and callable(_default_sigterm_handler):
                 _default_sigterm_handler(sig, frame)
 
         signal.signal(signal.SIGTERM, _closing_handler)
@@ -129,14 +194,17 @@ class Limiter(ABC):
 
             if self.memory is not None:
                 # We should probably warn if we exceed the memory usage before
-                # any limitation is set
-                memusage = Monitor().memory("B")
-                if self.memory <= memusage:
-                    self._raise_warning(
-                        f"Current memory usage in new process is {memusage}B but "
-                        f" setting limit to {self.memory}B. Likely to fail, try"
-                        f" increasing the memory limit"
-                    )
+                # any limitation is set. The check only exists for the warning,
+                # so skip the usage read entirely when warnings are off or the
+                # limit is too generous for a fresh process to exceed
+                if self.warnings and self.memory < _MEM_PRECHECK_THRESHOLD:
+                    memusage = Monitor().memory("B")
+                    if self.memory <= memusage:
+                        self._raise_warning(
+                            f"Current memory usage in new process is {memusage}B but "
+                            f" setting limit to {self.memory}B. Likely to fail, try"
+                            f" increasing the memory limit"
+                        )
                 self.limit_memory(self.memory)
 
             # Call our function
@@ -147,48 +215,33 @@ class Limiter(ABC):
         except BaseException as e:
             result = None
             error = e
-            tb = "".join(traceback.format_exception(*sys.exc_info()))
+            tb = _format_tb(e)
 
         if error is not None:
             error = self._wrap_error(error, *args, **kwargs)  # type: ignore
 
-        # Now let's try to send the result back
+        # Now let's try to send the result back. If that fails, fall back to
+        # sending the error we got from doing so and, as a last effort, the
+        # smallest None we can fit through. Each fallback is only constructed
+        # once the previous attempt has actually failed
         response = (result, error, tb)
         try:
-            self.output.send(response)
-            self.output.close()
-            if self.terminate_child_processes is True:
-                terminate_process(timeout=2, children=True, parent=False)
-            return
-        except Exception as e:
-            failed_send_tb = "".join(traceback.format_exception(*sys.exc_info()))
-            failed_send_response = (None, e, failed_send_tb)
-
-        # We failed to send the result back, lets try to send the errors we got from
-        # doing so
-        try:
-            self.output.send(failed_send_response)
-            self.output.close()
-            if self.terminate_child_processes is True:
-                terminate_process(timeout=2, children=True, parent=False)
-            return
-        except Exception:
+            self._send(response)
+        except BrokenPipeError:
+            # The parent end is gone, no fallback can succeed either
             pass
-
-        # One last effot to send the smallest None through
-        last_response_attempt = None
-        try:
-            self.output.send(last_response_attempt)
-            self.output.close()
-            if self.terminate_child_processes is True:
-                terminate_process(timeout=2, children=True, parent=False)
-            return
-        except Exception:
-            pass
-
-        # Look, everything failed, try kill any child processes and just kill this
-        # process is we can't for memory reasons
-        self.output.close()
+        except Exception as e:
+            for fallback in ((None, e, _format_tb(e)), None):
+                try:
+                    self._send(fallback)
+                    break
+                except Exception:
+                    pass
+
+        # Whether a response made it through or not, close the connection and
+        # clean up any child processes, killing this process if we can't for
+        # memory reasons
+        output.close()
         try:
             if self.terminate_child_processes is True:
                 terminate_process(timeout=2, children=True, parent=False)
@@ -197,10 +250,40 @@ class Limiter(ABC):
         finally:
             return
 
+    def _send(self, response: Any) -> None:
+        """Send a response back through the output connection.
+
+        Large payloads are handed back through a shared memory block, with
+        only a small handle going through the pipe, as `Connection.send`
+        becomes very slow for them.
+
+        Parameters
+        ----------
+        response : Any
+            The response to send back
+        """
+        output = self.output
+        assert output is not None, "`output` must be set before calling"
+
+        # Protocol 5 serializes large bytes/numpy payloads without the
+        # intermediate copies older protocols make
+        payload = pickle.dumps(response, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) >= _SHM_RESULT_THRESHOLD:
+            try:
+                handle = _SharedMemoryResponse.dump(payload)
+            except Exception:
+                # No shared memory available, fall back to the pipe
+                pass
+            else:
+                output.send(handle)
+                return
+
+        output.send_bytes(payload)
+
     @staticmethod
     def create(
         func: Callable,
-        output: Connection,
+        output: Connection | None = None,
         memory: int | None = None,
         cpu_time: int | None = None,
         wall_time: int | None = None,
@@ -209,76 +292,49 @@ class Limiter(ABC):
         terminate_child_processes: bool = True,
     ) -> Limiter:
         """For full documentation, see __init__."""
-        # NOTE: __init__ param duplication
-        #
-        #   I'm not delighted by the duplication of the __init__ params but this keeps
-        #   things typesafe and referencable in case we need to validate
-        arguments = {
-            "func": func,
-            "output": output,
-            "memory": memory,
-            "cpu_time": cpu_time,
-            "warnings": warnings,
-            "wrap_errors": wrap_errors,
-            "terminate_child_processes": terminate_child_processes,
-        }
-
-        # There is probably a lot more identifiers but for now this covers our use case
-        system_name = platform.system().lower()
-
-        # NOTE: Imports inside if statements
-        #
-        #   This serves two purposes, one is to prevent cyclical imports, as they need
-        #   to inherit Limiter from this file, while this file needs to import them too,
-        #   creating a circular dependancy... unless they're imported later.
-        #
-        #   Secondly, different systems will have different modules available.
-        #   For example, the `resources` module is not avialable on Windows and so
-        #   importing that would cause issues.
-        #
-        if system_name.startswith("linux"):
-            from pynisher.limiters.linux import LimiterLinux
-
-            return LimiterLinux(**arguments)  # type: ignore
-
-        elif system_name.startswith("darwin"):
-            from pynisher.limiters.mac import LimiterMac
-
-            return LimiterMac(**arguments)  # type: ignore
-
-        elif system_name.startswith("win"):
-            from pynisher.limiters.windows import LimiterWindows
-
-            return LimiterWindows(**arguments)  # type: ignore
-
-        else:
-            raise NotImplementedError(
-                f"We currently don't support your system: {platform}"
-            )
+        limiter_cls = _limiter_class()
+        return limiter_cls(
+            func=func,
+            output=output,
+            memory=memory,
+            cpu_time=cpu_time,
+            wall_time=wall_time,
+            warnings=warnings,
+            wrap_errors=wrap_errors,
+            terminate_child_processes=terminate_child_processes,
+        )
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Check subclasses provide the platform specific limiting.
+
+        Validated once here at class definition rather than using ABC,
+        whose abstractness check would otherwise run on every construction
+        and a fresh Limiter is constructed per subprocess.
+        """
+        super().__init_subclass__(**kwargs)
+        for required in ("limit_memory", "limit_cpu_time"):
+            if getattr(cls, required, None) is getattr(Limiter, required):
+                raise TypeError(f"{cls.__name__} must implement `{required}`")
 
-    @abstractmethod
     def limit_memory(self, memory: int) -> None:
         """Limit's the memory of this process."""
-        ...
+        raise NotImplementedError
 
-    @abstractmethod
     def limit_cpu_time(self, cpu_time: int) -> None:
         """Limit's the cpu time of this process."""
-        ...
+        raise NotImplementedError
 
     def _raise_warning(self, msg: str) -> None:
         if self.warnings is True:
             print(msg, file=sys.stderr)
 
     def _wrap_error(self, err: Exception, *args: Any, **kwargs: Any) -> Exception:
-        _wrap_message = f"Wrapped Exception {type(err).__name__} - {err}"
-
         # Catch memory errors first, these don't count as `wrap_errors=False`
         # as we need to catch memory errors that occur due to limits
         if self.memory and (
             isinstance(err, MemoryError)
             or (
-                sys.platform.lower().startswith("win")
+                _IS_WIN
                 and isinstance(err, OSError)
                 and getattr(err, "winerr", None) == WIN_ERROR_COMMITMENT_LIMIT
             )
@@ -297,15 +353,16 @@ class Limiter(ABC):
         if self.wrap_errors is False:
             return err
 
+        # Only built once we know some wrapping will be considered, the
+        # common `wrap_errors=False` path above never formats the error
+        _wrap_message = f"Wrapped Exception {type(err).__name__} - {err}"
+
         if self.wrap_errors is True:
             return PynisherException(_wrap_message)
 
-        if isinstance(self.wrap_errors, (list, set, tuple)):
-            mapping = {"pynisher": self.wrap_errors}
-        elif isinstance(self.wrap_errors, dict):
-            mapping = self.wrap_errors
-        else:
-            raise ValueError(f"Arg `wrap_errors` is ill formatted {self.wrap_errors}")
+        # Normalized in __init__
+        assert self._wrap_mapping is not None
+        mapping = self._wrap_mapping
 
         if self.cpu_time is not None and "cpu_time" in mapping:
             if any(is_err(err, err_type) for err_type in mapping["cpu_time"]):
@@ -316,26 +373,28 @@ class Limiter(ABC):
                 return WallTimeoutException(_wrap_message)
 
         if self.memory is not None and "memory" in mapping:
+            # The same two attributes are compared against every candidate,
+            # look them up once rather than per entry in the mapping
+            err_errno = getattr(err, "errno", None)
+            err_winerr = getattr(err, "winerr", None)
+
             for t in mapping["memory"]:
                 # Windows specific errors
                 if isinstance(t, tuple) and len(t) == 3:
                     errT, errno, winerr = t
 
-                    is_type = is_err(err, errT)
-                    has_errno = getattr(err, "errno", None) == errno
-                    has_winerr = getattr(err, "winerr", None) == winerr
-
-                    if is_type and has_errno and has_winerr:
+                    if (
+                        is_err(err, errT)
+                        and err_errno == errno
+                        and err_winerr == winerr
+                    ):
                         return MemoryLimitException(_wrap_message)
 
                 # OSError with codes
                 elif isinstance(t, tuple) and len(t) == 2:
-                    errT, errno, winerr = t
-
-                    is_type = is_err(err, errT)
-                    has_errno = getattr(err, "errno", None) == errno
+                    errT, errno = t
 
-                    if is_type and has_errno:
+                    if is_err(err, errT) and err_errno == errno:
                         return MemoryLimitException(_wrap_message)
 
                 # `t` is just a straight Exception
@@ -347,3 +406,45 @@ class Limiter(ABC):
                 return PynisherException(_wrap_message)
 
         return err
+
+
+@lru_cache(maxsize=None)
+def _limiter_class() -> Type[Limiter]:
+    """Resolve which Limiter to use for this system.
+
+    Cached as the system can't change between calls, meaning the platform
+    check and the platform-specific import only happen once.
+
+    NOTE: Imports inside if statements
+
+      This serves two purposes, one is to prevent cyclical imports, as they need
+      to inherit Limiter from this file, while this file needs to import them too,
+      creating a circular dependancy... unless they're imported later.
+
+      Secondly, different systems will have different modules available.
+      For example, the `resources` module is not avialable on Windows and so
+      importing that would cause issues.
+    """
+    # `sys.platform` is set at interpreter startup, unlike `platform.system()`
+    # which issues a `uname()` call on every lookup
+    system_name = sys.platform.lower()
+
+    if system_name.startswith("linux"):
+        from pynisher.limiters.linux import LimiterLinux
+
+        return LimiterLinux
+
+    elif system_name.startswith("darwin"):
+        from pynisher.limiters.mac import LimiterMac
+
+        return LimiterMac
+
+    elif system_name.startswith("win"):
+        from pynisher.limiters.windows import LimiterWindows
+
+        return LimiterWindows
+
+    else:
+        raise NotImplementedError(
+            f"We currently don't support your system: {sys.platform}"
+        )
@@ -17,8 +17,16 @@ import resource
 
 from pynisher.limiters.limiter import Limiter
 
+# The initial RLIMIT_AS limits, read once at import. With a `fork` context this
+# is inherited from the parent, making limiting memory in the subprocess a
+# single `setrlimit` call instead of a `getrlimit`/`setrlimit` pair before the
+# function can run. The hard limit is not something we modify.
+_RLIMIT_AS_INITIAL = resource.getrlimit(resource.RLIMIT_AS)
+
 
 class LimiterLinux(Limiter):
+    __slots__ = ("old_limits",)
+
     def limit_memory(self, memory: int) -> None:
         """Limit the addressable memory.
 
@@ -31,7 +39,7 @@ class LimiterLinux(Limiter):
         memory : int
             The memory limit in bytes
         """
-        soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+        soft, hard = _RLIMIT_AS_INITIAL
 
         self.old_limits = (soft, hard)
         new_limits = (memory, hard)
@@ -68,12 +76,9 @@ class LimiterLinux(Limiter):
         Returns
         -------
         (usage: str)
-            Returns the usage as a string, not sure if always KB but
-            leaving type as str until known.
+            The peak resident memory as a string, in KB on Linux
         """
-        # https://stackoverflow.com/a/39765583/5332072
-        with open("/proc/self/status") as f:
-            status = f.readlines()
-
-        vmpeak = next(s for s in status if s.startswith("VmPeak:"))
-        return vmpeak
+        # A single `getrusage` syscall rather than opening and scanning
+        # `/proc/self/status`. `ru_maxrss` is KB on Linux
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return f"peak rss: {peak}KB"
@@ -26,32 +26,22 @@ incase of specific modules or changes needed
 """
 from __future__ import annotations
 
-from typing import Any
-
 import resource
 
-from pynisher.exceptions import CpuTimeoutException
 from pynisher.limiters.limiter import Limiter
 
-
-def raise_on_cpu_limit(signum: Any, frame: Any) -> None:
-    """Raise a `RuntimeError` when the CPU limit is reached.
-
-    This is a signal handler for `SIGXCPU` which is sent when the CPU time limit
-    is reached. This is a signal that is sent to the process, not the thread, so
-    we need to make sure that we only raise the exception in the main thread.
-
-    Parameters
-    ----------
-    signum : int
-        The signal number
-    frame : FrameType
-        The current stack frame
-    """
-    raise CpuTimeoutException("CPU time limit exceeded")
+# The initial RLIMIT_AS limits, read once at import rather than with a
+# `getrlimit` call per `limit_memory`. The hard limit is not something
+# we modify. Guarded as even reading the limit may not be supported
+try:
+    _RLIMIT_AS_INITIAL: tuple[int, int] | None = resource.getrlimit(resource.RLIMIT_AS)
+except Exception:
+    _RLIMIT_AS_INITIAL = None
 
 
 class LimiterMac(Limiter):
+    __slots__ = ("old_limits",)
+
     def limit_memory(self, memory: int) -> None:
         """Limit the addressable memory
 
@@ -70,7 +60,10 @@ class LimiterMac(Limiter):
         # This will likely do nothing on newer mac, however users can check for support
         # before hand to prevent issues.
         try:
-            soft, hard = resource.getrlimit(resource.RLIMIT_AS)
+            if _RLIMIT_AS_INITIAL is None:
+                raise RuntimeError("Could not read RLIMIT_AS")
+
+            soft, hard = _RLIMIT_AS_INITIAL
 
             self.old_limits = (soft, hard)
             new_limits = (memory, hard)
@@ -22,11 +22,37 @@ pywin32
 * https://github.com/mhammond/pywin32
 """
 
+# Imported once here rather than inside each method. The modules are left as
+# None when pywin32 is missing (or when this module is inspected from a
+# non-Windows system) and each entry point raises with the message above
+try:
+    import win32api
+    import win32job
+    import winerror
+except ModuleNotFoundError:
+    win32api = None  # type: ignore
+    win32job = None  # type: ignore
+    winerror = None  # type: ignore
+
 # Not sure it's actual type
 WIN32JOB = Any
 
+# Job time limits are expressed in 100ns units (1e+9 / 100 per second)
+_HUNDRED_NS_PER_SEC = 10_000_000
+
 
 class LimiterWindows(Limiter):
+    __slots__ = ("_job", "_job_info")
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        """For full documentation, see Limiter.__init__."""
+        super().__init__(*args, **kwargs)
+
+        # Sentinels for the cached accessors below, a plain `is None` check
+        # is cheaper than the hasattr dance on an unset slot
+        self._job: WIN32JOB | None = None
+        self._job_info: dict | None = None
+
     def job(self) -> WIN32JOB:
         """Get the job associated with this process.
 
@@ -38,15 +64,10 @@ class LimiterWindows(Limiter):
             A Windows job which consists of one or more processes. In this case
             we just have the one process
         """
-        if not hasattr(self, "_job"):
-            # First try to import stuff, an easy exception to catch and give good
-            # information about
-            try:
-                import win32api
-                import win32job
-                import winerror
-            except ModuleNotFoundError as e:
-                raise ModuleNotFoundError(_win32_import_error_msg) from e
+        if self._job is None:
+            # An easy exception to catch and give good information about
+            if win32job is None:
+                raise ModuleNotFoundError(_win32_import_error_msg)
 
             # Here, we assign it to a windows "Job", whatever that is
             # If the process is already assigned to a job, then we have
@@ -76,33 +97,58 @@ class LimiterWindows(Limiter):
 
         return self._job
 
+    def job_info(self) -> dict:
+        """Get the extended limit information for our job object.
+
+        Queried once and cached: both `limit_memory` and `limit_cpu_time`
+        mutate the same extended struct (it embeds the basic one), so when
+        both limits are set only the first pays for the kernel round-trip.
+
+        Returns
+        -------
+        dict
+            The `JobObjectExtendedLimitInformation` for `self.job()`
+        """
+        if self._job_info is None:
+            # An easy exception to catch and give good information about
+            if win32job is None:
+                raise ModuleNotFoundError(_win32_import_error_msg)
+
+            enum_for_info = win32job.JobObjectExtendedLimitInformation
+            self._job_info = win32job.QueryInformationJobObject(
+                self.job(), enum_for_info
+            )
+
+        return self._job_info
+
     def limit_memory(self, memory: int) -> None:
         """Limit's the memory of this process."""
         # https://stackoverflow.com/a/54958772/5332072
 
-        # First try to import stuff, an easy exception to catch and give good
-        # information about
-        try:
-            import win32job
-        except ModuleNotFoundError as e:
-            raise ModuleNotFoundError(_win32_import_error_msg) from e
-
-        job = self.job()
+        # An easy exception to catch and give good information about
+        if win32job is None:
+            raise ModuleNotFoundError(_win32_import_error_msg)
 
-        # Get the information for the job object we created
-        enum_for_info = win32job.JobObjectExtendedLimitInformation
-        info = win32job.QueryInformationJobObject(job, enum_for_info)
+        info = self.job_info()
 
         # This appears to by bytes by looking for "JOB_OBJECT_LIMIT_JOB_MEMORY"
         # on github, specifically Python code
         info["ProcessMemoryLimit"] = memory
 
-        # Mask of which limit flag to set
-        mask_limit_memory = win32job.JOB_OBJECT_LIMIT_PROCESS_MEMORY
+        # Also cap the job as a whole: the per-process limit alone would give
+        # every child the function spawns its own full quota
+        info["JobMemoryLimit"] = memory
+
+        # Mask of which limit flags to set
+        mask_limit_memory = (
+            win32job.JOB_OBJECT_LIMIT_PROCESS_MEMORY
+            | win32job.JOB_OBJECT_LIMIT_JOB_MEMORY
+        )
         info["BasicLimitInformation"]["LimitFlags"] |= mask_limit_memory
 
         # Finally set the new information
-        win32job.SetInformationJobObject(job, enum_for_info, info)
+        enum_for_info = win32job.JobObjectExtendedLimitInformation
+        win32job.SetInformationJobObject(self.job(), enum_for_info, info)
 
     def limit_cpu_time(self, cpu_time: int) -> None:
         """Limit's the cpu time of this process.
@@ -120,26 +166,20 @@ class LimiterWindows(Limiter):
         cpu_time: int
             How many seconds to limit the process for
         """
-        # First try to import stuff, an easy exception to catch and give good
-        # information about
-        try:
-            import win32job
-        except ModuleNotFoundError as e:
-            raise ModuleNotFoundError(_win32_import_error_msg) from e
+        # An easy exception to catch and give good information about
+        if win32job is None:
+            raise ModuleNotFoundError(_win32_import_error_msg)
 
-        job = self.job()
-
-        # Get the information for the job object we created
-        enum_for_info = win32job.JobObjectBasicLimitInformation
-        info = win32job.QueryInformationJobObject(job, enum_for_info)
+        info = self.job_info()
 
         # Set the time limit
-        time = round(cpu_time * 10_000_000)  # In 100ns units (1e+9 / 100)
-        info["PerProcessUserTimeLimit"] = time
+        time = round(cpu_time * _HUNDRED_NS_PER_SEC)
+        info["BasicLimitInformation"]["PerProcessUserTimeLimit"] = time
 
         # Activate the flag to turn on the limiting of cput time
         flag = win32job.JOB_OBJECT_LIMIT_PROCESS_TIME
-        info["LimitFlags"] |= flag
+        info["BasicLimitInformation"]["LimitFlags"] |= flag
 
         # Finally set the new information
-        win32job.SetInformationJobObject(job, enum_for_info, info)
+        enum_for_info = win32job.JobObjectExtendedLimitInformation
+        win32job.SetInformationJobObject(self.job(), enum_for_info, info)
@@ -2,13 +2,15 @@ from __future__ import annotations
 
 from typing import Any, Callable, Generic, Type, TypeVar, overload
 
+import copy
 import multiprocessing
 import signal
 import sys
 import threading
 import time
 import warnings
-from functools import wraps
+from functools import lru_cache, wraps
+from multiprocessing.connection import wait as connection_wait
 from multiprocessing.context import BaseContext
 
 import psutil
@@ -18,7 +20,13 @@ import pynisher.exceptions
 from pynisher.limiters import Limiter
 from pynisher.support import contexts as valid_contexts
 from pynisher.support import supports
-from pynisher.util import callstring, memconvert, terminate_process, timeconvert
+from pynisher.util import (
+    _SharedMemoryResponse,
+    callstring,
+    memconvert,
+    terminate_process,
+    timeconvert,
+)
 from pynisher.win_errcodes import WIN_CPUTIMEOUT_EXITCODES, WIN_MEMORY_EXITCODES
 
 
@@ -28,6 +36,123 @@ class _EMPTY:
 
 EMPTY = _EMPTY()
 
+
+# O(1) membership test for validating the `context` argument
+_VALID_CONTEXTS = frozenset(valid_contexts)
+
+# Preload lists already submitted to the forkserver. The preload setting is
+# global to the forkserver process so repeated Pynisher constructions with the
+# same modules shouldn't re-submit it
+_forkserver_preloaded: set[tuple[str, ...]] = set()
+
+
+class _CallHandle:
+    """The subprocess and receive pipe of one in-flight call.
+
+    Registered per call rather than on the Pynisher instance so concurrent
+    calls on the same Pynisher each get their own cleanup entry instead of
+    clobbering a shared slot.
+    """
+
+    __slots__ = ("subprocess", "receive_pipe")
+
+    def __init__(self, subprocess: Any, receive_pipe: Any) -> None:
+        self.subprocess = subprocess
+        self.receive_pipe = receive_pipe
+
+    def cleanup(self) -> None:
+        """Kill the subprocess and close the receive pipe.
+
+        Called from the module level SIGTERM handler. Best effort only: with
+        the `fork` context the registry is inherited by forked children, where
+        these Process handles are not ours to operate on and raise
+        """
+        try:
+            if self.subprocess.is_alive():
+                self.subprocess.kill()
+
+            self.receive_pipe.close()
+
+            self.subprocess.join(0.1)
+        except Exception:
+            pass
+
+
+# Calls with a subprocess currently running. One module level SIGTERM handler
+# cleans all of them up, rather than each call installing its own closure and
+# overwriting whatever the previous call installed
+_active_calls: set[_CallHandle] = set()
+
+_sigterm_handler_installed = False
+_default_sigterm_handler: signal._HANDLER = None
+
+
+def _sigterm_cleanup_handler(
+    sig: int, frame: Any, _sigterm: int = int(signal.SIGTERM)
+) -> None:
+    """Kill the subprocess and close the pipe of every in-flight call.
+
+    Compared with `==` as handlers receive a plain int, not the enum.
+    """
+    for call in list(_active_calls):
+        call.cleanup()
+
+    # Let the default handler run
+    if sig == _sigterm and callable(_default_sigterm_handler):
+        _default_sigterm_handler(sig, frame)
+
+
+def _install_sigterm_handler() -> None:
+    """Install the cleanup handler, once per process.
+
+    May only be called from the main thread, as `signal.signal` raises
+    otherwise.
+    """
+    global _sigterm_handler_installed, _default_sigterm_handler
+
+    if _sigterm_handler_installed:
+        return
+
+    previous = signal.getsignal(signal.SIGTERM)
+    if previous is signal.Handlers.SIG_IGN:
+        warnings.warn(
+            "SIGTERM is ignored by this process, ignoring this as the"
+            " output connection must be closed "
+        )
+
+    _default_sigterm_handler = previous
+    signal.signal(signal.SIGTERM, _sigterm_cleanup_handler)
+    _sigterm_handler_installed = True
+
+
+@lru_cache(maxsize=None)
+def _get_context(name: str | None) -> BaseContext:
+    """Resolve a context name to its context object.
+
+    Cached as `multiprocessing.get_context` walks the context registry and
+    lazily imports the backend each time, which adds up when `Pynisher` is
+    constructed per call, e.g. through the `restricted` decorator.
+    """
+    return multiprocessing.get_context(name)
+
+
+def _default_context_name() -> str | None:
+    """The default multiprocessing context to use when the user gave none.
+
+    The platform default on Mac and Windows is `spawn` which boots a fresh
+    interpreter and re-imports modules for every call. As pynisher is often
+    used in tight loops, we prefer `fork` where it's safe (Linux) and
+    `forkserver` on Mac, which only pays the import cost once. Windows only
+    supports `spawn`, in which case we leave the choice to multiprocessing.
+    """
+    if sys.platform.lower().startswith("linux"):
+        return "fork"
+    elif sys.platform.lower().startswith("darwin"):
+        return "forkserver"
+    else:
+        return None
+
+
 # For typing the pynished function
 T = TypeVar("T")
 P = ParamSpec("P")
@@ -57,6 +182,7 @@ class Pynisher(Generic[P, T]):
         cpu_time: int | tuple[float, str] | None = ...,
         wall_time: int | tuple[float, str] | None = ...,
         context: str | BaseContext | None = ...,
+        preload: list[str] | None = ...,
         warnings: bool = ...,
         wrap_errors: bool | list[str | Type[Exception]] | dict[str, Any] = ...,
         terminate_child_processes: bool = ...,
@@ -77,6 +203,7 @@ class Pynisher(Generic[P, T]):
         cpu_time: int | tuple[float, str] | None = ...,
         wall_time: int | tuple[float, str] | None = ...,
         context: str | BaseContext | None = ...,
+        preload: list[str] | None = ...,
         warnings: bool = ...,
         wrap_errors: bool | list[str | Type[Exception]] | dict[str, Any] = ...,
         terminate_child_processes: bool = ...,
@@ -93,6 +220,7 @@ class Pynisher(Generic[P, T]):
         cpu_time: int | tuple[float, str] | None = None,
         wall_time: int | tuple[float, str] | None = None,
         context: str | BaseContext | None = None,
+        preload: list[str] | None = None,
         raises: bool = True,
         warnings: bool = True,
         wrap_errors: bool | list[str | Type[Exception]] | dict[str, Any] = False,
@@ -133,6 +261,18 @@ class Pynisher(Generic[P, T]):
             The context to use with multiprocessing.get_context()
             * https://docs.python.org/3/library/multiprocessing.html#multiprocessing.get_context
 
+            If None, defaults to "fork" on Linux and "forkserver" on Mac to
+            avoid the interpreter startup cost of "spawn" on every call.
+            Windows keeps the multiprocessing default ("spawn").
+
+        preload : list[str] | None = None
+            Modules to preload into the forkserver, e.g. ["numpy", "sklearn"].
+            With the "forkserver" context, children are forked from the server
+            process, so modules preloaded there are imported once rather than
+            on every call. Ignored for other contexts, where there is either
+            no server to preload ("spawn") or the parent's modules are
+            inherited already ("fork").
+
         raises : bool = True
             Whether any error from the subprocess should filter up and be raised.
 
@@ -237,7 +377,7 @@ class Pynisher(Generic[P, T]):
         if _memory is not None and not _memory >= 1:
             raise ValueError(f"`memory` {memory} must be >= 1 Byte")
 
-        if isinstance(context, str) and context not in valid_contexts:
+        if isinstance(context, str) and context not in _VALID_CONTEXTS:
             raise ValueError(f"`context` {context} must be in {valid_contexts}")
 
         if isinstance(wrap_errors, dict):
@@ -254,17 +394,43 @@ class Pynisher(Generic[P, T]):
         self.cpu_time = _cpu_time
         self.memory = _memory
         self.wall_time = _wall_time
+        if context is None:
+            context = _default_context_name()
+
         self.raises = raises
         self.context = (
-            multiprocessing.get_context(context)
+            _get_context(context)
             if isinstance(context, str) or context is None
             else context
         )
+
+        # The preload list is global to the forkserver, only submit it if we
+        # haven't asked for these modules before. Once the server is running
+        # further preloads have no effect anyway
+        if preload and getattr(self.context, "_name", None) == "forkserver":
+            key = tuple(preload)
+            if key not in _forkserver_preloaded:
+                self.context.set_forkserver_preload(list(preload))
+                _forkserver_preloaded.add(key)
         self.warnings = warnings
         self.wrap_errors = wrap_errors
         self.terminate_child_processes = terminate_child_processes
         self.forceful_keyboard_interrupt = forceful_keyboard_interrupt
 
+        # The limiter's configuration is fixed for the lifetime of this Pynisher
+        # so we create it once here and only attach the per-call output pipe in
+        # __call__, rather than paying the platform dispatch and construction
+        # cost on every call
+        self._limiter = Limiter.create(
+            func=self.func,
+            memory=self.memory,
+            cpu_time=self.cpu_time,
+            wall_time=self.wall_time,
+            warnings=self.warnings,
+            wrap_errors=self.wrap_errors,
+            terminate_child_processes=self.terminate_child_processes,
+        )
+
         # Set once the function is running
         self._process: psutil.Process | None = None
 
@@ -326,17 +492,13 @@ class Pynisher(Generic[P, T]):
         receive_pipe, send_pipe = self.context.Pipe(duplex=False)
 
         # The limiter is in charge of limiting resources once inside the subprocess
-        # It gets the `send_pipe` through which it it should `output` it's results to
-        limiter = Limiter.create(
-            func=self.func,
-            output=send_pipe,
-            memory=self.memory,
-            cpu_time=self.cpu_time,
-            wall_time=self.wall_time,
-            warnings=self.warnings,
-            wrap_errors=self.wrap_errors,
-            terminate_child_processes=self.terminate_child_processes,
-        )
+        # It gets the `send_pipe` through which it it should `output` it's results to.
+        # A shallow copy per call keeps the handoff safe for concurrent calls on
+        # the same Pynisher - attaching the pipe to the shared instance would let
+        # one caller's child send its result into another caller's pipe. The copy
+        # is a handful of slot loads, far cheaper than re-validating construction
+        limiter = copy.copy(self._limiter)
+        limiter.output = send_pipe
 
         # We now create the subprocess and let it know that it should call the limiter's
         # __call__ with the args and kwargs for the function being limited
@@ -349,34 +511,27 @@ class Pynisher(Generic[P, T]):
         )
 
         # Make sure that if this process is killed, make any connections are closed
-        # and the subprocess is killed
+        # and the subprocess is killed. The handler itself is installed once at
+        # module level and works off the registry of in-flight calls, so we
+        # only record ourselves here
 
         # However, there is a problem if this is used in tests where we can only set a
         # signal handler if this currently running thread is the main interpreter thread
         # Therefore we can only properly set this when `threading.main_thread()`
         if threading.main_thread() is threading.current_thread():
-            _default_sigterm_handler: signal._HANDLER = signal.getsignal(signal.SIGTERM)
-            if _default_sigterm_handler is signal.Handlers.SIG_IGN:
-                warnings.warn(
-                    f"SIGTERM is ignored by this process for this function {self.func},"
-                    " ignoring this as the output connection must be closed "
-                )
-
-            def _closing_handler(sig: int, frame: Any) -> None:
-                if subprocess.is_alive():
-                    subprocess.kill()
-
-                receive_pipe.close()
-                subprocess.join(0.1)
-
-                # Let the default handler run
-                if sig is signal.SIGTERM and callable(_default_sigterm_handler):
-                    _default_sigterm_handler(sig, frame)
+            _install_sigterm_handler()
 
-            signal.signal(signal.SIGTERM, _closing_handler)
+        call_handle = _CallHandle(subprocess, receive_pipe)
+        _active_calls.add(call_handle)
 
-        # Let loose
-        subprocess.start()
+        # Let loose. If the start itself fails, e.g. the function can't be
+        # pickled under "spawn", there is no subprocess to clean up - drop
+        # the registry entry again rather than leak it
+        try:
+            subprocess.start()
+        except BaseException:
+            _active_calls.discard(call_handle)
+            raise
 
         # Get a psutil handle to the process
         try:
@@ -401,24 +556,30 @@ class Pynisher(Generic[P, T]):
 
         # Retrieve a result if we can. We have to manually loop this because if the
         # subprocess abruptly crashes in such a way that the pipe never closes, we will
-        # hang forever
+        # hang forever. Waiting on both the pipe and the process sentinel lets us
+        # block until something actually happened instead of waking on an interval
         start = time.time()
-        interval = 0.01
+        walltime_expired = False
         try:
             while True:
-                if (
-                    self.wall_time is not None
-                    and (time.time() - start) > self.wall_time
-                ):
-                    result = EMPTY
-                    tb = None
-                    err = pynisher.exceptions.WallTimeoutException(
-                        f"Your function took longer than {self.wall_time} seconds to"
-                        f" run.\n{callstring(self.func, *args, **kwargs)}",
-                    )
-                    break
-                elif receive_pipe.poll(interval):
+                timeout: float | None = None
+                if self.wall_time is not None:
+                    timeout = self.wall_time - (time.time() - start)
+                    if timeout <= 0:
+                        result = EMPTY
+                        tb = None
+                        walltime_expired = True
+                        err = pynisher.exceptions.WallTimeoutException(
+                            f"Your function took longer than {self.wall_time} seconds"
+                            f" to run.\n{callstring(self.func, *args, **kwargs)}",
+                        )
+                        break
+
+                ready = connection_wait([receive_pipe, subprocess.sentinel], timeout)
+                if receive_pipe in ready:
                     response = receive_pipe.recv()
+                    if isinstance(response, _SharedMemoryResponse):
+                        response = response.load()
                     if response is not None:
                         result, err, tb = response
                     else:
@@ -431,12 +592,20 @@ class Pynisher(Generic[P, T]):
                             f"\n{callstring(self.func, *args, **kwargs)}",
                         )
                     break
-                elif not subprocess.is_alive():
+                elif subprocess.sentinel in ready:
+                    # Make sure multiprocessing reaps the process and records
+                    # the exitcode now. The terminate_process cleanup below
+                    # also waits on the pid and would otherwise consume the
+                    # exit status first, leaving exitcode as None and
+                    # misreporting why the process died
+                    subprocess.join()
                     result = EMPTY
                     tb = None
                     err = None
                     break
 
+                # Otherwise we timed out, loop back around to flag the wall time
+
         # Otherwise, there was nothing to read
         except EOFError:
             result = EMPTY
@@ -453,12 +622,14 @@ class Pynisher(Generic[P, T]):
             # this, we convert this keyboard interrupt into a SIGTERM and propgate it
             try:
                 # We assume this will return if all subprocess have terminated
-                # due to the keyboard interrupt
+                # due to the keyboard interrupt. `join` blocks on the process
+                # sentinel in the kernel and simply returns with the process
+                # still alive once the timeout elapses, it does not raise
                 subprocess.join(timeout=1)
-            except TimeoutError:
+
                 # If not, we will escalate the keyboard interrupt to a SIGTERM
                 # and give the subprocesses a chance to terminate
-                if self.forceful_keyboard_interrupt:
+                if subprocess.is_alive() and self.forceful_keyboard_interrupt:
                     terminate_process(
                         subprocess.pid,
                         children=self.terminate_child_processes,
@@ -474,39 +645,44 @@ class Pynisher(Generic[P, T]):
                 )
 
                 # If the subprocesses are still alive, we will send a SIGKILL
-                try:
-                    subprocess.join(0.1)
-                except TimeoutError:
+                subprocess.join(timeout=0.1)
+                if subprocess.is_alive():
                     terminate_process(
                         subprocess.pid,
                         children=self.terminate_child_processes,
                         parent=True,
                         sig=signal.SIGKILL,
                     )
-                finally:
-                    # At this point, we have tried to terminate the subprocesses
-                    # as gracefully as possible. We now wait for them to terminate
-                    # and close the pipes
-                    try:
-                        subprocess.join(1)
-                    except TimeoutError:
-                        pass
-
-                    receive_pipe.close()
-                    send_pipe.close()
+
+                # At this point, we have tried to terminate the subprocesses
+                # as gracefully as possible. We now wait for them to terminate
+                # and close the pipes
+                subprocess.join(timeout=1)
+
+                receive_pipe.close()
+                send_pipe.close()
 
             raise KeyboardInterrupt from e
         finally:
+            # This call no longer needs the SIGTERM cleanup
+            _active_calls.discard(call_handle)
+
             # Close the pipes
             receive_pipe.close()
             send_pipe.close()
 
-            # Tell the subprocess to terminate with SIGTERM
-            terminate_process(
-                subprocess.pid,
-                children=self.terminate_child_processes,
-                parent=True,
-            )
+            # Tell the subprocess to terminate with SIGTERM. If the wall time
+            # already expired there is no result worth letting it clean up for,
+            # so skip straight to SIGKILL rather than waiting out a SIGTERM.
+            # If it already exited on its own and we're not responsible for
+            # cleaning up its children, there's nothing to wait on at all
+            if self.terminate_child_processes or subprocess.exitcode is None:
+                terminate_process(
+                    subprocess.pid,
+                    children=self.terminate_child_processes,
+                    parent=True,
+                    sig=signal.SIGKILL if walltime_expired else signal.SIGTERM,
+                )
 
         # exitcode here can only take on 3 values
         #
@@ -797,20 +973,27 @@ def restricted(
         raise ValueError("Please pass arguments to decorator `@restricted`")
 
     def decorator(func: Callable[P, T]) -> Callable[P, T | _EMPTY]:
+        # Constructed once at decoration time, each call just forwards to it,
+        # skipping the validation and limiter construction on every call.
+        # This is safe for concurrent calls as __call__ keeps its state local:
+        # the limiter is copied per call before the pipe is attached and each
+        # call registers its own cleanup handle. The only shared attribute is
+        # the informational `_process` handle of the latest call
+        pynisher = Pynisher(
+            func,
+            name=name,
+            memory=memory,
+            cpu_time=cpu_time,
+            wall_time=wall_time,
+            raises=raises,
+            warnings=True,
+            wrap_errors=False,
+            terminate_child_processes=True,
+            forceful_keyboard_interrupt=True,
+        )
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> T | _EMPTY:
-            pynisher = Pynisher(
-                func,
-                name=name,
-                memory=memory,
-                cpu_time=cpu_time,
-                wall_time=wall_time,
-                raises=raises,
-                warnings=True,
-                wrap_errors=False,
-                terminate_child_processes=True,
-                forceful_keyboard_interrupt=True,
-            )
             return pynisher(*args, **kwargs)
 
         return wrapper
@@ -3,8 +3,10 @@ from __future__ import annotations
 from typing import Any, Callable
 
 import os
+import pickle
 import signal
 from functools import partial
+from multiprocessing import resource_tracker, shared_memory
 
 import psutil
 from psutil import Process
@@ -38,17 +40,24 @@ def memconvert(x: float, *, frm: str = "B", to: str = "B") -> float:
     float
         The memory amount
     """
-    u_from = _mem_unit_table[frm.upper()]
-    u_to = _mem_unit_table[to.upper()]
+    frm = frm.upper()
+    to = to.upper()
 
-    as_bytes = x * u_from
-    as_target = as_bytes / u_to
+    # No conversion needed, skip the table lookups and float math.
+    # This is the common case when monitoring memory in bytes
+    if frm == to:
+        return round(x) if to == "B" else x
 
-    # We can't see a use case for float Bytes
-    if to.upper() == "B":
-        return round(as_target)
-    else:
-        return as_target
+    u_from = _mem_unit_table[frm]
+    u_to = _mem_unit_table[to]
+
+    # We can't see a use case for float Bytes. Converting down to bytes also
+    # stays in integer arithmetic, with no float division by 1
+    if to == "B":
+        return round(x * u_from)
+
+    as_bytes = x * u_from
+    return as_bytes / u_to
 
 
 def timeconvert(x: float, *, frm: str = "s", to: str = "s") -> float:
@@ -70,8 +79,15 @@ def timeconvert(x: float, *, frm: str = "s", to: str = "s") -> float:
     float
         The time amount
     """
-    u_from = _time_unit_table[frm.lower()]
-    u_to = _time_unit_table[to.lower()]
+    frm = frm.lower()
+    to = to.lower()
+
+    # No conversion needed
+    if frm == to:
+        return x
+
+    u_from = _time_unit_table[frm]
+    u_to = _time_unit_table[to]
 
     as_seconds = x * u_from
     as_target = as_seconds / u_to
@@ -186,6 +202,10 @@ def terminate_process_tree(
     if include_parent and parent is not None:
         children.append(parent)
 
+    # Nothing spawned and no parent to kill, skip the signal/wait machinery
+    if not children:
+        return ([], [])
+
     for child in children:
         try:
             child.send_signal(sig)
@@ -205,6 +225,90 @@ def terminate_process_tree(
     return (gone, alive)
 
 
+class _SharedMemoryResponse:
+    """A pickled response stored in a shared memory block.
+
+    Sending large results back through the result pipe is extremely slow as
+    `Connection.send` copies the pickled payload through the pipe in small
+    chunks. Instead, the subprocess can place the payload in a shared memory
+    block and send just this small handle through the pipe. The receiver then
+    reconstructs the response straight from the block with `load`, which also
+    unlinks it.
+
+    Ownership of the block is handed over to the receiver upon creation. If
+    the handle never arrives, e.g. the subprocess was killed mid-send, the
+    block is leaked until the system cleans it up.
+    """
+
+    def __init__(self, name: str, size: int) -> None:
+        """
+        Parameters
+        ----------
+        name : str
+            The name of the shared memory block
+
+        size : int
+            The size in bytes of the pickled payload stored in the block
+        """
+        self.name = name
+        self.size = size
+
+    @classmethod
+    def dump(cls, payload: bytes) -> _SharedMemoryResponse:
+        """Place a pickled payload into a newly created shared memory block
+
+        Parameters
+        ----------
+        payload : bytes
+            The pickled response to store
+
+        Returns
+        -------
+        _SharedMemoryResponse
+            The handle to send through the pipe
+        """
+        shm = shared_memory.SharedMemory(create=True, size=len(payload))
+        buf = shm.buf
+        assert buf is not None
+
+        try:
+            buf[: len(payload)] = payload
+        finally:
+            shm.close()
+
+        # Hand ownership over to whoever receives this handle. Without this,
+        # the resource tracker of this process would unlink the block when the
+        # process exits, possibly before the receiver has read it.
+        # The tracker registered the raw posix name, i.e. with the leading
+        # "/" that the public `name` property strips
+        registered_name = f"/{shm.name}" if os.name == "posix" else shm.name
+        resource_tracker.unregister(registered_name, "shared_memory")
+
+        return cls(shm.name, len(payload))
+
+    def load(self) -> Any:
+        """Reconstruct the response and unlink the shared memory block
+
+        Returns
+        -------
+        Any
+            The unpickled response
+        """
+        shm = shared_memory.SharedMemory(name=self.name)
+        buf = shm.buf
+        assert buf is not None
+
+        try:
+            view = buf[: self.size]
+            try:
+                return pickle.loads(view)
+            finally:
+                del view
+        finally:
+            shm.close()
+            shm.unlink()
+
+
 class Monitor:
     def __init__(self, pid: int | None = None):
         """
@@ -180,3 +180,28 @@ def test_func_can_return_none(context: str) -> None:
     rf = Pynisher(return_none, context=context)
     result = rf()
     assert result is None
+
+
+@pytest.mark.skipif("forkserver" not in contexts, reason="No forkserver on system")
+def test_preload_with_forkserver(context: str = "forkserver") -> None:
+    """
+    Expects
+    -------
+    * Preloading modules into the forkserver should not change any results
+    """
+    rf = Pynisher(get_process_id, context=context, preload=["pynisher"])
+
+    this_process_id = os.getpid()
+    other_process_id = rf()
+
+    assert this_process_id != other_process_id
+
+
+def test_preload_ignored_outside_forkserver() -> None:
+    """
+    Expects
+    -------
+    * The preload argument should be silently ignored for other contexts
+    """
+    rf = Pynisher(get_process_id, context=contexts[0], preload=["pynisher"])
+    assert rf() != os.getpid()
@@ -11,6 +11,11 @@ def return_large_value() -> bytearray:
     return large_value
 
 
+def return_shm_sized_value() -> bytes:
+    """Returns a value large enough to be sent back through shared memory"""
+    return bytes(int(memconvert(8, frm="MB")))
+
+
 @pytest.mark.parametrize("context", contexts)
 def test_large_return_value(context: str) -> None:
     """
@@ -33,3 +38,16 @@ def test_large_return_value(context: str) -> None:
     lf = limit(return_large_value)
     with pytest.raises(ValueError):
         lf()
+
+
+@pytest.mark.parametrize("context", contexts)
+def test_large_return_value_through_shared_memory(context: str) -> None:
+    """
+    Expects
+    -------
+    * Return values past the shared memory threshold arrive back intact,
+    being handed over through a shared memory block instead of the pipe.
+    """
+    lf = limit(return_shm_sized_value, context=context)
+    result = lf()
+    assert result == bytes(int(memconvert(8, frm="MB")))